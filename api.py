@@ -1,21 +1,48 @@
 # backend/api.py
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import List, Optional
-from pydantic import BaseModel
+import asyncio
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Path, Request, Response
+from fastapi.responses import ORJSONResponse
+from typing import Annotated, List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, ValidationError
 from backend import services
 
 router = APIRouter(prefix="/api", tags=["applicants"])
 
+# path id shared by every /applicants/{app_id} route so all verbs validate alike
+AppId = Annotated[int, Path(ge=1)]
+
 # Pydantic models
 class ApplicantCreate(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     name: str
     unit: Optional[str] = ""
 
 class ApplicantUpdate(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     status: Optional[str] = None
     risk: Optional[str] = None
 
+class BulkOp(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    action: Literal["create", "update", "delete"]
+    id: Optional[int] = None
+    payload: Optional[dict] = None
+
+class ApplicantStats(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    total: int
+    ready: int
+    denied: int
+    in_verification: int
+    in_document: int
+
 class ApplicantResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     id: int
     name: str
     unit: str
@@ -26,38 +53,72 @@ class ApplicantResponse(BaseModel):
     error_rate: str
 
 # Endpoints
+# Hot read endpoints return ORJSONResponse directly: services already hands back
+# clean dicts, so FastAPI's response validation is skipped. response_model stays
+# only to document the schema in OpenAPI.
 @router.get("/applicants", response_model=List[ApplicantResponse])
-def list_applicants():
-    return services.list_applicants()
+async def list_applicants(request: Request):
+    etag, applicants = await asyncio.to_thread(services.list_applicants_with_etag, request.headers.get("if-none-match"))
+    if applicants is None:
+        return Response(status_code=304, headers={"ETag": etag})
+    return ORJSONResponse(applicants, headers={"ETag": etag})
+
+@router.get("/applicants/stats", response_model=ApplicantStats)
+async def applicant_stats(request: Request):
+    etag, stats = await asyncio.to_thread(services.stats_with_etag, request.headers.get("if-none-match"))
+    if stats is None:
+        return Response(status_code=304, headers={"ETag": etag})
+    return ORJSONResponse(stats, headers={"ETag": etag})
+
+@router.post("/applicants/bulk")
+async def bulk_applicants(ops: List[BulkOp]):
+    # validate payloads with the single-op models so services only sees set fields
+    payload_models = {"create": ApplicantCreate, "update": ApplicantUpdate}
+    items = []
+    for op in ops:
+        if op.action != "create" and op.id is None:
+            raise HTTPException(status_code=422, detail=f"{op.action} requires id")
+        payload = None
+        if op.action in payload_models:
+            try:
+                payload = payload_models[op.action](**(op.payload or {})).model_dump(exclude_none=True)
+            except ValidationError as e:
+                raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+        items.append({"action": op.action, "id": op.id, "payload": payload})
+    try:
+        results = await asyncio.to_thread(services.bulk_apply, items)
+    except services.ApplicantNotFound as e:
+        raise HTTPException(status_code=404, detail=f"Applicant {e.app_id} not found; no changes applied")
+    return {"results": results}
 
 @router.get("/applicants/{app_id}", response_model=ApplicantResponse)
-def get_applicant(app_id: int):
-    app = services.get_applicant(app_id)
+async def get_applicant(app_id: AppId):
+    app = await asyncio.to_thread(services.get_applicant, app_id)
     if not app:
         raise HTTPException(status_code=404, detail="Applicant not found")
-    return app
+    return ORJSONResponse(app)
 
 @router.post("/applicants", response_model=ApplicantResponse, status_code=201)
-def create_applicant(payload: ApplicantCreate):
-    return services.create_applicant(payload.name, payload.unit or "")
+async def create_applicant(payload: ApplicantCreate):
+    return await asyncio.to_thread(services.create_applicant, payload.name, payload.unit or "")
 
 @router.patch("/applicants/{app_id}", response_model=ApplicantResponse)
-def patch_applicant(app_id: int, payload: ApplicantUpdate):
-    updated = services.update_applicant(app_id, payload.dict())
+async def patch_applicant(app_id: AppId, payload: ApplicantUpdate):
+    updated = await asyncio.to_thread(services.update_applicant, app_id, payload.model_dump(exclude_none=True))
     if not updated:
         raise HTTPException(status_code=404, detail="Applicant not found")
     return updated
 
 @router.delete("/applicants/{app_id}", status_code=204)
-def delete_applicant(app_id: int):
-    ok = services.delete_applicant(app_id)
+async def delete_applicant(app_id: AppId):
+    ok = await asyncio.to_thread(services.delete_applicant, app_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Applicant not found")
     return
 
 @router.post("/applicants/{app_id}/run-decision")
-def run_decision(app_id: int, background_tasks: BackgroundTasks):
-    if not services.get_applicant(app_id):
+async def run_decision(app_id: AppId, background_tasks: BackgroundTasks, request: Request):
+    if not await asyncio.to_thread(services.get_applicant, app_id):
         raise HTTPException(status_code=404, detail="Applicant not found")
-    services.enqueue_decision_agent(background_tasks, app_id)
-    return {"status": "queued", "applicant_id": app_id}
+    task_id = await services.enqueue_decision_agent(background_tasks, app_id, request.app.state.queue)
+    return {"status": "queued", "applicant_id": app_id, "task_id": task_id}
@@ -1,6 +1,10 @@
 import streamlit as st
 import pandas as pd
+import orjson
 import requests 
+from collections import Counter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 
 # --- Configuration ---
@@ -15,15 +19,50 @@ st.set_page_config(
 )
 
 # --- FastAPI API Call Functions ---
-# Use Streamlit's cache to reduce unnecessary calls to the API
-@st.cache_data(ttl=3) 
+# One pooled HTTP session shared across Streamlit reruns so connections are kept alive
+@st.cache_resource
+def get_http_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+SESSION = get_http_session()
+
+@st.cache_resource
+def get_etag_store():
+    """Last raw body and ETag per API path, shared by all sessions for revalidation."""
+    return {}
+
+def fetch_with_etag(path):
+    """GETs `path` with If-None-Match so an unchanged resource costs a bodiless 304.
+
+    The store keeps raw bytes and every call decodes its own copy, so sessions
+    never share (and cannot mutate) one another's objects.
+    """
+    store = get_etag_store()
+    cached = store.get(path)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    response = SESSION.get(f"{FASTAPI_BASE_URL}{path}", headers=headers)
+    if response.status_code == 304 and cached:
+        return orjson.loads(cached[1])
+    response.raise_for_status()
+    if "ETag" in response.headers:
+        store[path] = (response.headers["ETag"], response.content)
+    return orjson.loads(response.content)
+
+# Revalidated on every run (not st.cache_data) so backend-side changes, e.g. from
+# the decision agent, show up without a local write
 def fetch_applicants():
     """Fetches the list of all applicants from the FastAPI backend."""
     try:
         # FastAPI endpoint defined in backend/api.py
-        response = requests.get(f"{FASTAPI_BASE_URL}/applicants/")
-        response.raise_for_status() 
-        return response.json()
+        return fetch_with_etag("/api/applicants")
     except requests.exceptions.ConnectionError:
         st.error("Cannot connect to FastAPI backend. Ensure Uvicorn is running on port 8000.")
         return []
@@ -31,80 +70,85 @@ def fetch_applicants():
         st.error(f"Error fetching data: {e}")
         return []
 
-def send_action_to_api(endpoint, payload=None):
+APPLICANT_COLUMNS = ["id", "name", "unit", "date", "status", "risk", "income_match", "error_rate"]
+
+def applicants_frame(applicants):
+    """Builds the applicant table with fixed columns and dtypes, skipping inference."""
+    df = pd.DataFrame.from_records(applicants, columns=APPLICANT_COLUMNS)
+    return df.astype({"id": "int32"})
+
+EMPTY_STATS = {"total": 0, "ready": 0, "denied": 0, "in_verification": 0, "in_document": 0}
+
+def fetch_stats():
+    """Fetches pipeline status counts without pulling the full applicant list."""
+    try:
+        return fetch_with_etag("/api/applicants/stats")
+    except requests.exceptions.ConnectionError:
+        st.error("Cannot connect to FastAPI backend. Ensure Uvicorn is running on port 8000.")
+        return EMPTY_STATS
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error fetching stats: {e}")
+        return EMPTY_STATS
+
+def error_detail(e):
+    """FastAPI `detail` from a failed request; falls back to the exception text for non-JSON bodies."""
+    if e.response is None:
+        return str(e)
+    try:
+        return orjson.loads(e.response.content).get("detail", "Unknown error")
+    except (orjson.JSONDecodeError, AttributeError):
+        return str(e)
+
+def send_action_to_api(endpoint, payload=None, method="POST"):
     """Sends action requests (CRUD/Approve) to the backend."""
     try:
         # Ensure payload is sent as JSON
-        if payload:
-            response = requests.post(f"{FASTAPI_BASE_URL}{endpoint}", json=payload)
-        else:
-            response = requests.post(f"{FASTAPI_BASE_URL}{endpoint}")
-            
+        response = SESSION.request(method, f"{FASTAPI_BASE_URL}{endpoint}", json=payload)
         response.raise_for_status()
-        st.success(response.json().get("message", "Action successful."))
-        st.cache_data.clear() # Clear cache to force a refresh
-        time.sleep(1) # Wait slightly for the message to be seen before rerunning
-        st.rerun()
+        body = orjson.loads(response.content) if response.content else {}
+        st.toast(body.get("message", "Action successful."))
+        # Only the calling fragment reruns; sidebar metrics catch up on the next
+        # full run. The toast survives the rerun without a pause
+        st.rerun(scope="fragment")
     except requests.exceptions.RequestException as e:
-        error_detail = e.response.json().get("detail", "Unknown error") if e.response is not None else str(e)
-        st.error(f"API Error: {error_detail}")
+        st.error(f"API Error: {error_detail(e)}")
 
 # --- Streamlit Wrapper Functions (calling API) ---
 
 def add_applicant(name, unit):
-    send_action_to_api("/applicants/add", payload={"name": name, "unit": unit})
+    send_action_to_api("/api/applicants", payload={"name": name, "unit": unit})
 
 def update_applicant(app_id, new_status, new_risk):
-    send_action_to_api(f"/applicants/update/{app_id}", payload={"status": new_status, "risk": new_risk})
-
-def delete_applicant(app_id):
-    send_action_to_api(f"/applicants/delete/{app_id}")
+    send_action_to_api(f"/api/applicants/{app_id}", payload={"status": new_status, "risk": new_risk}, method="PATCH")
 
 def approve_applicant(app_id):
-    send_action_to_api(f"/applicants/approve/{app_id}")
+    send_action_to_api(f"/api/applicants/{app_id}", payload={"status": "Approved/Leased"}, method="PATCH")
 
+def delete_applicants(app_ids):
+    # one round-trip for the whole selection
+    send_action_to_api("/api/applicants/bulk", payload=[{"action": "delete", "id": app_id} for app_id in app_ids])
 
-# --- Sidebar Navigation and Metrics ---
-with st.sidebar:
-    st.title("⚡ Lease Lightning")
-    st.markdown("---")
-    
-    # Navigation state
-    view = st.radio("Current View", ["Applicant Pipeline", "Manage Applicants (CRUD)", "Lease Renewal Tracker", "Audit Log"], index=0)
-    
-    st.markdown("---")
-    st.header("Quick Metrics")
-    
-    applicants = fetch_applicants() # Fetches data from FastAPI
 
-    # Calculate derived metrics
-    total_applications = len(applicants)
-    ready_for_review = sum(1 for app in applicants if app['status'] == 'Decision Ready')
-    denied = sum(1 for app in applicants if app['status'] in ['Denied', 'Denied/Overridden'])
-    
-    st.metric(label="Total Applications", value=total_applications)
-    st.metric(label="Ready for Approval (GenAI Reviewed)", value=ready_for_review)
-    st.metric(label="Vacancy Loss Reduction (Mo.)", value="$4,500", delta="+$500 Mo.")
-    
-# --- Main Dashboard Content Rendering ---
+# --- Page Fragments ---
+# Each page body is a fragment so writes (see send_action_to_api) rerun only that block
 
-if view == "Applicant Pipeline":
-    st.header("Property Manager Dashboard: Applicant Pipeline")
-    st.markdown("Track applicants in real-time through the multi-agent screening workflow.")
+@st.fragment
+def render_pipeline():
+    applicants = fetch_applicants() # One conditional GET per render
 
-    # Create columns for high-level status count
+    # Status tiles live in the fragment so they refresh together with the table
+    status_counts = Counter(app['status'] for app in applicants)
     col1, col2, col3, col4 = st.columns(4)
-    col1.info(f"**{ready_for_review}** Ready for Approval")
-    col2.warning(f"**{sum(1 for app in applicants if app['status'] == 'Verification Agent')}** In Verification")
-    col3.success(f"**{sum(1 for app in applicants if app['status'] == 'Document Agent')}** Lease Generated (E-Sign)")
-    col4.error(f"**{denied}** Denied")
+    col1.info(f"**{status_counts['Decision Ready']}** Ready for Approval")
+    col2.warning(f"**{status_counts['Verification Agent']}** In Verification")
+    col3.success(f"**{status_counts['Document Agent']}** Lease Generated (E-Sign)")
+    col4.error(f"**{status_counts['Denied'] + status_counts['Denied/Overridden']}** Denied")
 
     st.markdown("---")
     st.subheader("Applicant Flow Table")
 
     # Display the main pipeline table
-    df = pd.DataFrame(applicants)
-    st.dataframe(df, use_container_width=True, hide_index=True)
+    st.dataframe(applicants_frame(applicants), use_container_width=True, hide_index=True)
 
     # --- Human-in-the-Loop Approval Gate (Key MVP Functionality) ---
 
@@ -145,11 +189,9 @@ if view == "Applicant Pipeline":
         st.info("No applications currently in the 'Decision Ready' stage. The AI Agents are processing other applications.")
 
 
-# --- New CRUD Management Page ---
-
-elif view == "Manage Applicants (CRUD)":
-    st.header("🛠️ Applicant Data Management")
-    st.warning("Manual editing of records is intended for testing, compliance audits, or data correction only.")
+@st.fragment
+def render_crud():
+    applicants = fetch_applicants() # One conditional GET per render
     
     # 1. ADD NEW APPLICANT
     st.subheader("➕ Add New Applicant (Manual Entry)")
@@ -201,18 +243,53 @@ elif view == "Manage Applicants (CRUD)":
     st.subheader("🗑️ Delete Applicant")
     with st.form("delete_form"):
         col_del1, col_del2 = st.columns([2, 1])
-        delete_id = col_del1.selectbox("Select Applicant ID to Delete", app_ids, key="delete_select") if app_ids else None
+        delete_ids = col_del1.multiselect("Select Applicant IDs to Delete", app_ids, key="delete_select")
         
-        st.warning(f"Are you sure you want to permanently delete record for ID: {delete_id}?")
+        st.warning(f"Are you sure you want to permanently delete records for IDs: {', '.join(map(str, delete_ids)) or '-'}?")
         
         delete_submitted = col_del2.form_submit_button("Confirm Delete", type="primary")
         
-        if delete_submitted and delete_id:
-            delete_applicant(delete_id)
+        if delete_submitted and delete_ids:
+            delete_applicants(delete_ids)
 
     st.markdown("---")
     st.subheader("Current Data Table")
-    st.dataframe(pd.DataFrame(applicants), use_container_width=True, hide_index=True)
+    st.dataframe(applicants_frame(applicants), use_container_width=True, hide_index=True)
+
+
+# --- Sidebar Navigation and Metrics ---
+with st.sidebar:
+    st.title("⚡ Lease Lightning")
+    st.markdown("---")
+    
+    # Navigation state
+    view = st.radio("Current View", ["Applicant Pipeline", "Manage Applicants (CRUD)", "Lease Renewal Tracker", "Audit Log"], index=0)
+    
+    st.markdown("---")
+    st.header("Quick Metrics")
+    
+    stats = fetch_stats() # Status counts only; pages that need rows fetch them below
+    
+    st.metric(label="Total Applications", value=stats['total'])
+    st.metric(label="Ready for Approval (GenAI Reviewed)", value=stats['ready'])
+    st.metric(label="Vacancy Loss Reduction (Mo.)", value="$4,500", delta="+$500 Mo.")
+    
+# --- Main Dashboard Content Rendering ---
+
+if view == "Applicant Pipeline":
+    st.header("Property Manager Dashboard: Applicant Pipeline")
+    st.markdown("Track applicants in real-time through the multi-agent screening workflow.")
+
+    render_pipeline()
+
+
+# --- New CRUD Management Page ---
+
+elif view == "Manage Applicants (CRUD)":
+    st.header("🛠️ Applicant Data Management")
+    st.warning("Manual editing of records is intended for testing, compliance audits, or data correction only.")
+
+    render_crud()
 
 
 # --- Other Views (Placeholders) ---
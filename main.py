@@ -1,10 +1,30 @@
 # backend/main.py
+from contextlib import asynccontextmanager
+
+import httpx
+from arq import create_pool
+from arq.connections import RedisSettings
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from backend.config.settings import ALLOWED_ORIGINS
+from backend.config.settings import ALLOWED_ORIGINS, REDIS_URL
 from backend.api import router as api_router
+from backend import services
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    services.ensure_seeded()
+    # shared outbound client so connections/TLS sessions are reused across requests
+    app.state.http = httpx.AsyncClient(timeout=5, limits=httpx.Limits(max_keepalive_connections=20))
+    # decision jobs go to Redis when configured (run `arq backend.worker.WorkerSettings`)
+    app.state.queue = await create_pool(RedisSettings.from_dsn(REDIS_URL)) if REDIS_URL else None
+    yield
+    if app.state.queue is not None:
+        await app.state.queue.close()
+    await app.state.http.aclose()
 
-app = FastAPI(title="Lease Lightning API", version="0.1.0")
+app = FastAPI(title="Lease Lightning API", version="0.1.0", lifespan=lifespan, redirect_slashes=False,
+              default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,5 +37,5 @@ app.add_middleware(
 app.include_router(api_router)
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"status": "ok", "message": "Lease Lightning API running"}
@@ -0,0 +1,15 @@
+# backend/run.py
+# production entrypoint: `python -m backend.run`
+import uvicorn
+
+from backend.config.settings import APP_HOST, APP_PORT, APP_WORKERS
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "backend.main:app",
+        host=APP_HOST,
+        port=APP_PORT,
+        workers=APP_WORKERS,
+        loop="auto",  # uvloop when installed (not on Windows), else asyncio
+        http="httptools",
+    )
@@ -1,14 +1,22 @@
 # backend/services.py
-import json
-from pathlib import Path
-from threading import Lock
+import hashlib
+from collections import Counter
+import sqlite3
+import threading
 from datetime import datetime
 import asyncio
 
+import orjson
+
 from backend.config.settings import DATA_DIR
 
-DATA_FILE = DATA_DIR / "applicants.json"
-_lock = Lock()
+DB_FILE = DATA_DIR / "applicants.db"
+LEGACY_FILE = DATA_DIR / "applicants.json"  # pre-SQLite store, imported once if present
+COLUMNS = ("id", "name", "unit", "date", "status", "risk", "income_match", "error_rate")
+_local = threading.local()
+_watch = None
+_watch_lock = threading.Lock()
+_cache = {"version": None, "data": [], "by_id": {}, "etag": None}
 
 # seed default (same as your Streamlit file)
 DEFAULTS = [
@@ -19,69 +27,167 @@ DEFAULTS = [
     {"id": 1005, "name": "Eva Rodriguez", "unit": "308D", "date": "2025-11-14", "status": "Denied", "risk": "High", "income_match": "60%", "error_rate": "N/A"},
 ]
 
-def _read():
-    if not DATA_FILE.exists():
-        with DATA_FILE.open("w") as f:
-            json.dump(DEFAULTS, f, indent=2)
-        return DEFAULTS.copy()
-    with DATA_FILE.open("r") as f:
-        return json.load(f)
+def _conn():
+    # one connection per worker thread; SQLite handles locking between them
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+    return conn
+
+def ensure_seeded():
+    """Create the schema and seed rows on a fresh database; call once at startup.
+
+    A fresh database imports the old applicants.json when it exists, so
+    deployments keep their data; otherwise it is seeded with DEFAULTS.
+    """
+    conn = _conn()
+    # user_version 0 means a brand-new database file: create schema and seed it
+    if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+        seed = DEFAULTS
+        if LEGACY_FILE.exists():
+            seed = [{c: a.get(c) for c in COLUMNS} for a in orjson.loads(LEGACY_FILE.read_bytes())]
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS applicants("
+            "id INTEGER PRIMARY KEY, name TEXT, unit TEXT, date TEXT, "
+            "status TEXT, risk TEXT, income_match TEXT, error_rate TEXT)"
+        )
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO applicants VALUES "
+                "(:id, :name, :unit, :date, :status, :risk, :income_match, :error_rate)",
+                seed,
+            )
+        conn.execute("PRAGMA user_version = 1")
 
-def _write(data):
-    with DATA_FILE.open("w") as f:
-        json.dump(data, f, indent=2)
+def _data_version():
+    # a connection that never writes sees data_version change on every commit
+    # made by any other connection, in this process or another
+    global _watch
+    with _watch_lock:
+        if _watch is None:
+            _watch = sqlite3.connect(DB_FILE, check_same_thread=False)
+        return _watch.execute("PRAGMA data_version").fetchone()[0]
+
+def _snapshot():
+    # parsed rows are reused until the database changes; the version is read
+    # before the rows so a concurrent commit can only cause an extra refresh
+    global _cache
+    conn = _conn()
+    version = _data_version()
+    cache = _cache
+    if cache["version"] != version:
+        rows = conn.execute("SELECT * FROM applicants ORDER BY id").fetchall()
+        data = [dict(r) for r in rows]
+        # content-based so every worker process hands out the same tag
+        etag = '"%s"' % hashlib.blake2b(orjson.dumps(data), digest_size=12).hexdigest()
+        cache = {"version": version, "data": data, "by_id": {a["id"]: a for a in data}, "etag": etag}
+        _cache = cache
+    return cache
 
 def list_applicants():
-    with _lock:
-        return _read()
+    # copy rows so callers cannot mutate the shared cache
+    return [dict(a) for a in _snapshot()["data"]]
+
+def list_applicants_with_etag(if_none_match=None):
+    # rows are copied only when the client's tag is stale; a match returns None
+    cache = _snapshot()
+    if cache["etag"] == if_none_match:
+        return cache["etag"], None
+    return cache["etag"], [dict(a) for a in cache["data"]]
+
+def _count_statuses(data):
+    counts = Counter(a["status"] for a in data)
+    return {
+        "total": len(data),
+        "ready": counts["Decision Ready"],
+        "denied": counts["Denied"] + counts["Denied/Overridden"],
+        "in_verification": counts["Verification Agent"],
+        "in_document": counts["Document Agent"],
+    }
+
+def stats():
+    return _count_statuses(_snapshot()["data"])
+
+def stats_with_etag(if_none_match=None):
+    # counted from the same snapshot as the tag, and only when the tag is stale
+    cache = _snapshot()
+    if cache["etag"] == if_none_match:
+        return cache["etag"], None
+    return cache["etag"], _count_statuses(cache["data"])
 
 def get_applicant(app_id):
-    with _lock:
-        data = _read()
-        for a in data:
-            if a["id"] == app_id:
-                return a
-    return None
+    a = _snapshot()["by_id"].get(app_id)
+    return dict(a) if a else None
+
+def _insert(conn, name, unit):
+    cur = conn.execute(
+        "INSERT INTO applicants (id, name, unit, date, status, risk, income_match, error_rate) "
+        "VALUES ((SELECT COALESCE(MAX(id), 1000) + 1 FROM applicants), ?, ?, ?, ?, ?, ?, ?)",
+        (name, unit, datetime.now().strftime("%Y-%m-%d"), "Submitted/Manual", "Pending", "N/A", "N/A"),
+    )
+    return cur.lastrowid
+
+def _update(conn, app_id, updates: dict):
+    # returns False when the applicant does not exist; callers pass only set fields
+    fields = {k: v for k, v in updates.items() if k in COLUMNS and k != "id"}
+    if not fields:
+        return conn.execute("SELECT 1 FROM applicants WHERE id = ?", (app_id,)).fetchone() is not None
+    assignments = ", ".join(f"{k} = ?" for k in fields)
+    cur = conn.execute(f"UPDATE applicants SET {assignments} WHERE id = ?", (*fields.values(), app_id))
+    return cur.rowcount > 0
+
+def _delete(conn, app_id):
+    cur = conn.execute("DELETE FROM applicants WHERE id = ?", (app_id,))
+    return cur.rowcount > 0
 
 def create_applicant(name, unit):
-    with _lock:
-        data = _read()
-        new_id = max((a["id"] for a in data), default=1000) + 1
-        new = {
-            "id": new_id,
-            "name": name,
-            "unit": unit,
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "status": "Submitted/Manual",
-            "risk": "Pending",
-            "income_match": "N/A",
-            "error_rate": "N/A",
-        }
-        data.append(new)
-        _write(data)
-        return new
+    conn = _conn()
+    with conn:
+        new_id = _insert(conn, name, unit)
+    return get_applicant(new_id)
 
 def update_applicant(app_id, updates: dict):
-    with _lock:
-        data = _read()
-        for i, a in enumerate(data):
-            if a["id"] == app_id:
-                for k, v in updates.items():
-                    if v is not None:
-                        a[k] = v
-                data[i] = a
-                _write(data)
-                return a
-    return None
+    conn = _conn()
+    with conn:
+        found = _update(conn, app_id, updates)
+    return get_applicant(app_id) if found else None
 
 def delete_applicant(app_id):
-    with _lock:
-        data = _read()
-        new = [a for a in data if a["id"] != app_id]
-        if len(new) == len(data):
-            return False
-        _write(new)
-        return True
+    conn = _conn()
+    with conn:
+        return _delete(conn, app_id)
+
+class ApplicantNotFound(LookupError):
+    def __init__(self, app_id):
+        super().__init__(app_id)
+        self.app_id = app_id
+
+def bulk_apply(ops):
+    """Apply a list of create/update/delete ops in a single transaction.
+
+    Each op is a dict with ``action``, ``id`` and ``payload``; returns one
+    ``{"action", "id"}`` result per op, in order. If an update or delete
+    targets a missing applicant the whole batch is rolled back and
+    ``ApplicantNotFound`` is raised.
+    """
+    conn = _conn()
+    results = []
+    with conn:
+        for op in ops:
+            action, app_id, payload = op["action"], op.get("id"), op.get("payload") or {}
+            if action == "create":
+                app_id = _insert(conn, payload["name"], payload.get("unit") or "")
+            elif action == "update":
+                if not _update(conn, app_id, payload):
+                    raise ApplicantNotFound(app_id)
+            elif not _delete(conn, app_id):
+                raise ApplicantNotFound(app_id)
+            results.append({"action": action, "id": app_id})
+    return results
 
 # ---- Agent / Background work ----
 async def _mock_decision_engine(applicant):
@@ -91,15 +197,21 @@ async def _mock_decision_engine(applicant):
     risk = "Low" if applicant["id"] % 2 == 0 else "Medium"
     return {"status": "Decision Ready", "risk": risk, "note": f"Processed at {datetime.utcnow().isoformat()}"}
 
-def enqueue_decision_agent(background_tasks, applicant_id: int):
-    # schedule the coroutine in background via asyncio.run in a separate task
-    async def task():
-        applicant = get_applicant(applicant_id)
-        if not applicant:
-            return
-        res = await _mock_decision_engine(applicant)
-        # update DB after processing
-        update_applicant(applicant_id, {"status": res["status"], "risk": res["risk"]})
-
-    # run the task non-blocking for FastAPI request handling
-    background_tasks.add_task(asyncio.run, task())
+async def run_decision_agent(applicant_id: int):
+    # blocking DB calls run in a thread so the event loop stays free
+    applicant = await asyncio.to_thread(get_applicant, applicant_id)
+    if not applicant:
+        return
+    res = await _mock_decision_engine(applicant)
+    # update DB after processing
+    await asyncio.to_thread(update_applicant, applicant_id, {"status": res["status"], "risk": res["risk"]})
+
+async def enqueue_decision_agent(background_tasks, applicant_id: int, queue=None):
+    # prefer the Redis-backed arq queue when configured; returns its job id
+    if queue is not None:
+        job = await queue.enqueue_job("run_decision", applicant_id)
+        return job.job_id
+
+    # BackgroundTasks awaits coroutine functions on the running loop after the response
+    background_tasks.add_task(run_decision_agent, applicant_id)
+    return None
@@ -1,4 +1,5 @@
 # backend/config/settings.py
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -7,9 +8,14 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 APP_HOST = "0.0.0.0"
 APP_PORT = 8000
+# uvicorn worker processes; SQLite (WAL) storage is safe to share between them
+APP_WORKERS = int(os.getenv("APP_WORKERS", os.cpu_count() or 1))
 
 ALLOWED_ORIGINS = [
     "http://localhost:8501",  # Streamlit
     "http://127.0.0.1:8501",
     "http://localhost:3000",
 ]
+
+# Redis broker for the decision-agent job queue (arq); unset = in-process BackgroundTasks
+REDIS_URL = os.getenv("REDIS_URL")
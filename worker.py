@@ -0,0 +1,17 @@
+# backend/worker.py
+# arq worker for decision-agent jobs: `arq backend.worker.WorkerSettings`
+from arq.connections import RedisSettings
+
+from backend import services
+from backend.config.settings import REDIS_URL
+
+async def startup(ctx):
+    services.ensure_seeded()
+
+async def run_decision(ctx, applicant_id: int):
+    await services.run_decision_agent(applicant_id)
+
+class WorkerSettings:
+    functions = [run_decision]
+    on_startup = startup
+    redis_settings = RedisSettings.from_dsn(REDIS_URL or "redis://localhost:6379")